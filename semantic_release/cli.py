@@ -3,6 +3,8 @@
 import logging
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, wraps
 
 import click
 import click_log
@@ -48,6 +50,17 @@ SECRET_NAMES = [
     "GL_TOKEN",
 ]
 
+# Configuration values shown in the debug output of the main command
+MAIN_CONFIG_KEYS = (
+    "check_build_status",
+    "commit_subject",
+    "commit_message",
+    "commit_parser",
+    "patch_without_tag",
+    "upload_to_pypi",
+    "version_source",
+)
+
 COMMON_OPTIONS = [
     click_log.simple_verbosity_option(logger),
     click.option(
@@ -85,6 +98,24 @@ def common_options(func):
     return func
 
 
+def handle_errors(func):
+    """
+    Decorator that logs any error raised by a command, without its secrets, and exits
+    """
+
+    @wraps(func)
+    def wrapper(**kwargs):
+        try:
+            return func(**kwargs)
+        except Exception as error:
+            logger.error(filter_output_for_secrets(str(error)))
+            # Let click exit with the error code, instead of the `exit` builtin
+            # that is only available when the site module is loaded
+            click.get_current_context().exit(1)
+
+    return wrapper
+
+
 def version(**kwargs):
     """
     Detect the new version according to git log and semver.
@@ -97,16 +128,23 @@ def version(**kwargs):
     else:
         logger.info("Creating new version")
 
-    # Get the current version number
-    try:
-        current_version = get_current_version()
-        logger.info("Current version: {0}".format(current_version))
-    except GitError as e:
-        logger.error(str(e))
-        return False
+    # When called from publish, the already computed current_version, new_version
+    # and level_bump are passed in to avoid reading them from git again
+    current_version = kwargs.get("current_version")
+    if current_version is None:
+        try:
+            current_version = get_current_version()
+        except GitError as e:
+            logger.error(str(e))
+            return False
+    logger.info("Current version: {0}".format(current_version))
+
     # Find what the new version number should be
-    level_bump = evaluate_version_bump(current_version, kwargs["force_level"])
-    new_version = get_new_version(current_version, level_bump)
+    level_bump = kwargs.get("level_bump")
+    new_version = kwargs.get("new_version")
+    if new_version is None:
+        level_bump = evaluate_version_bump(current_version, kwargs["force_level"])
+        new_version = get_new_version(current_version, level_bump)
 
     if new_version == current_version and not retry:
         logger.info("No release will be made.")
@@ -133,11 +171,15 @@ def version(**kwargs):
 
     # Bump the version
     set_new_version(new_version)
-    if config.get(
-        "semantic_release",
-        "commit_version_number",
-        fallback=(config.get("semantic_release", "version_source") == "commit"),
-    ):
+    if config.has_option("semantic_release", "commit_version_number"):
+        commit_version_number = config.getboolean(
+            "semantic_release", "commit_version_number"
+        )
+    else:
+        commit_version_number = (
+            config.get("semantic_release", "version_source") == "commit"
+        )
+    if commit_version_number:
         commit_new_version(new_version)
     tag_new_version(new_version)
 
@@ -159,32 +201,37 @@ def changelog(**kwargs):
             "is setup correctly"
         )
 
-    previous_version = get_previous_version(current_version)
-
     # Generate the changelog
     if kwargs["unreleased"]:
         log = generate_changelog(current_version, None)
     else:
+        # Walking back to the previous release is only needed for released changes
+        previous_version = get_previous_version(current_version)
         log = generate_changelog(previous_version, current_version)
-    logger.info(markdown_changelog(current_version, log, header=False))
+    changelog_md = markdown_changelog(current_version, log, header=False)
+    logger.info(changelog_md)
 
     # Post changelog to HVCS if enabled
     if not kwargs.get("noop") and kwargs.get("post"):
         if check_token():
             owner, name = get_repository_owner_and_name()
             logger.info("Posting changelog to HVCS")
-            post_changelog(
-                owner,
-                name,
-                current_version,
-                markdown_changelog(current_version, log, header=False),
-            )
+            post_changelog(owner, name, current_version, changelog_md)
         else:
             logger.error("Missing token: cannot post changelog to HVCS")
 
 
 def publish(**kwargs):
     """Run the version task, then push to git and upload to PyPI / GitHub Releases."""
+    owner, name = get_repository_owner_and_name()
+
+    branch = config.get("semantic_release", "branch")
+    logger.debug(f"Running publish on branch {branch}")
+    ci_checks.check(branch)
+    checkout(branch)
+
+    # Compute the versions once on the release branch, they are reused by the
+    # version task below
     current_version = get_current_version()
 
     retry = kwargs.get("retry")
@@ -194,19 +241,20 @@ def publish(**kwargs):
         # "current" version will be the previous version.
         new_version = current_version
         current_version = get_previous_version(current_version)
+        # The version task compares against the actual current version
+        computed_versions = {"current_version": new_version}
     else:
         # Calculate the new version
         level_bump = evaluate_version_bump(current_version, kwargs["force_level"])
         new_version = get_new_version(current_version, level_bump)
-
-    owner, name = get_repository_owner_and_name()
-
-    branch = config.get("semantic_release", "branch")
-    logger.debug(f"Running publish on branch {branch}")
-    ci_checks.check(branch)
-    checkout(branch)
-
-    if version(**kwargs):  # Bump to the new version if needed
+        computed_versions = {
+            "current_version": current_version,
+            "new_version": new_version,
+            "level_bump": level_bump,
+        }
+
+    # Bump to the new version if needed
+    if version(**computed_versions, **kwargs):
         # A new version was released
         logger.info("Pushing new version")
         push_new_version(
@@ -217,6 +265,8 @@ def publish(**kwargs):
             domain=get_domain(),
         )
 
+        have_token = check_token()
+
         # Get config options for uploads
         dist_path = config.get("semantic_release", "dist_path")
         remove_dist = config.getboolean("semantic_release", "remove_dist")
@@ -231,36 +281,62 @@ def publish(**kwargs):
                 remove_dists(dist_path)
             build_dists()
 
-        if upload_pypi:
-            logger.info("Uploading to PyPI")
-            upload_to_pypi(
-                path=dist_path,
-                username=os.environ.get("PYPI_USERNAME"),
-                password=os.environ.get("PYPI_PASSWORD"),
-                # If we are retrying, we don't want errors for files that are already on PyPI.
-                skip_existing=retry,
-            )
+        # PyPI and the HVCS are independent, so upload to both at the same time
+        errors = []
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = []
+            if upload_pypi:
+                logger.info("Uploading to PyPI")
+                futures.append(
+                    executor.submit(
+                        upload_to_pypi,
+                        path=dist_path,
+                        username=os.environ.get("PYPI_USERNAME"),
+                        password=os.environ.get("PYPI_PASSWORD"),
+                        # If we are retrying, we don't want errors for files that are already on PyPI.
+                        skip_existing=retry,
+                    )
+                )
 
-        if check_token():
-            # Update changelog on HVCS
-            logger.info("Posting changelog to HVCS")
+            # Walk the commits for the changelog while PyPI is uploading, so that
+            # generating it does not hold back the distributions
             try:
-                log = generate_changelog(current_version, new_version)
-                post_changelog(
-                    owner,
-                    name,
-                    new_version,
-                    markdown_changelog(new_version, log, header=False),
-                )
-            except GitError:
-                logger.error("Posting changelog failed")
-        else:
-            logger.warning("Missing token: cannot post changelog to HVCS")
+                changelog_md = None
+                if have_token:
+                    try:
+                        log = generate_changelog(current_version, new_version)
+                        changelog_md = markdown_changelog(
+                            new_version, log, header=False
+                        )
+                    except GitError:
+                        logger.error("Posting changelog failed")
+                else:
+                    logger.warning("Missing token: cannot post changelog to HVCS")
+
+                # Without a token we cannot upload to the HVCS release
+                release_path = dist_path if upload_release and have_token else None
+                if changelog_md is not None or release_path is not None:
+                    futures.append(
+                        executor.submit(
+                            publish_to_hvcs,
+                            owner,
+                            name,
+                            new_version,
+                            changelog_md,
+                            release_path,
+                        )
+                    )
+            except Exception as changelog_error:
+                # Still wait for the PyPI upload, so that its failure is not lost
+                errors.append(changelog_error)
+
+        # Report every failure, then fail with the first one
+        errors += [e for e in (future.exception() for future in futures) if e]
+        for error in errors[1:]:
+            logger.error(filter_output_for_secrets(str(error)))
+        if errors:
+            raise errors[0]
 
-        # Upload to GitHub Releases
-        if upload_release and check_token():
-            logger.info("Uploading to HVCS release")
-            upload_to_release(owner, name, new_version, dist_path)
         # Remove distribution files as they are no longer needed
         if remove_dist:
             remove_dists(dist_path)
@@ -270,21 +346,63 @@ def publish(**kwargs):
     # else: Since version shows a message on failure, we do not need to print another.
 
 
+def publish_to_hvcs(owner, name, version, changelog_md=None, dist_path=None):
+    """
+    Post the changelog to the HVCS release, then upload the distributions to it.
+
+    The upload has to come second, because the release is created when
+    the changelog is posted.
+
+    :param changelog_md: The markdown changelog, or None to skip posting it.
+    :param dist_path: Path to the distributions, or None to skip uploading them.
+    """
+    if changelog_md is not None:
+        # Update changelog on HVCS
+        logger.info("Posting changelog to HVCS")
+        try:
+            post_changelog(owner, name, version, changelog_md)
+        except GitError:
+            logger.error("Posting changelog failed")
+
+    # Upload to GitHub Releases
+    if dist_path is not None:
+        logger.info("Uploading to HVCS release")
+        upload_to_release(owner, name, version, dist_path)
+
+
+@lru_cache(maxsize=None)
+def get_secrets():
+    """
+    Map the value of each secret set in the environment to its name.
+
+    The environment does not change while the CLI runs, so it is only read once.
+    """
+    secrets = {}
+    for secret_name in SECRET_NAMES:
+        secret = os.environ.get(secret_name)
+        if secret:
+            secrets[secret] = secret_name
+    return secrets
+
+
 def filter_output_for_secrets(message):
     """Remove secrets from cli output."""
     output = message
-    for secret_name in SECRET_NAMES:
-        secret = os.environ.get(secret_name)
-        if secret != "" and secret is not None:
-            output = output.replace(secret, "${}".format(secret_name))
+    secrets = get_secrets()
+    # Replace the longest secrets first, so that a secret containing another
+    # one is not only partially hidden
+    for secret in sorted(secrets, key=len, reverse=True):
+        output = output.replace(secret, "${}".format(secrets[secret]))
 
     return output
 
 
 def entry():
-    # Move flags to after the command
-    ARGS = sorted(sys.argv[1:], key=lambda x: 1 if x.startswith("--") else -1)
-    main(args=ARGS)
+    # Move flags to after the command, keeping the order within each group
+    flags, others = [], []
+    for arg in sys.argv[1:]:
+        (flags if arg.startswith("--") else others).append(arg)
+    main(args=others + flags)
 
 
 #
@@ -297,35 +415,25 @@ def entry():
 @click.group()
 @common_options
 def main(**kwargs):
-    logger.debug("Main args:", kwargs)
+    # Everything below is only logged, so skip building it at the default log level
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
+
+    logger.debug("Main args: %s", kwargs)
     message = ""
     for secret_name in SECRET_NAMES:
         message += '{}="{}",'.format(secret_name, os.environ.get(secret_name))
-    logger.debug("Environment:", filter_output_for_secrets(message))
-
-    obj = {}
-    for key in [
-        "check_build_status",
-        "commit_subject",
-        "commit_message",
-        "commit_parser",
-        "patch_without_tag",
-        "upload_to_pypi",
-        "version_source",
-    ]:
-        val = config.get("semantic_release", key)
-        obj[key] = val
-    logger.debug("Main config:", obj)
+    logger.debug("Environment: %s", filter_output_for_secrets(message))
+
+    obj = {key: config.get("semantic_release", key) for key in MAIN_CONFIG_KEYS}
+    logger.debug("Main config: %s", obj)
 
 
 @main.command(name="publish", help=publish.__doc__)
 @common_options
+@handle_errors
 def cmd_publish(**kwargs):
-    try:
-        return publish(**kwargs)
-    except Exception as error:
-        logger.error(filter_output_for_secrets(str(error)))
-        exit(1)
+    return publish(**kwargs)
 
 
 @main.command(name="changelog", help=changelog.__doc__)
@@ -334,22 +442,16 @@ def cmd_publish(**kwargs):
     "--unreleased/--released",
     help="Decides whether to show the released or unreleased changelog.",
 )
+@handle_errors
 def cmd_changelog(**kwargs):
-    try:
-        return changelog(**kwargs)
-    except Exception as error:
-        logger.error(filter_output_for_secrets(str(error)))
-        exit(1)
+    return changelog(**kwargs)
 
 
 @main.command(name="version", help=version.__doc__)
 @common_options
+@handle_errors
 def cmd_version(**kwargs):
-    try:
-        return version(**kwargs)
-    except Exception as error:
-        logger.error(filter_output_for_secrets(str(error)))
-        exit(1)
+    return version(**kwargs)
 
 
 if __name__ == "__main__":
@@ -2,20 +2,22 @@
 """
 import logging
 
-from invoke import run
-
 from .settings import config
 
 logger = logging.getLogger(__name__)
 
 
 def build_dists():
+    from invoke import run
+
     command = config.get("semantic_release", "build_command")
     logger.info(f"Running {command}")
     run(command)
 
 
 def remove_dists(path: str):
+    from invoke import run
+
     command = f"rm -rf {path}"
     logger.debug(f"Running {command}")
     run(command)
@@ -112,7 +112,7 @@ def get_previous_version(version: str) -> Optional[str]:
         if found_version:
             matches = re.match(r"v?(\d+.\d+.\d+)", commit_message)
             if matches:
-                logger.debug("Version matches regex", commit_message)
+                logger.debug("Version matches regex %s", commit_message)
                 return matches.group(1).strip()
 
     return get_last_version([version, "v{}".format(version)])
@@ -3,11 +3,9 @@
 import logging
 import mimetypes
 import os
+from functools import lru_cache
 from typing import Optional
 
-import gitlab
-import requests
-
 from .errors import ImproperConfigurationError
 from .helpers import LoggedFunction
 from .settings import config
@@ -19,6 +17,18 @@ logger = logging.getLogger(__name__)
 mimetypes.add_type("application/octet-stream", ".whl")
 
 
+@lru_cache(maxsize=None)
+def get_session():
+    """Get the requests session shared by all the HVCS API calls
+
+    Reusing one session keeps the connections to the HVCS alive between calls,
+    instead of opening a new one for each request.
+    """
+    import requests
+
+    return requests.Session()
+
+
 class Base(object):
     @staticmethod
     def domain() -> str:
@@ -94,7 +104,7 @@ class Github(Base):
         :return: Was the build status success?
         """
         url = "{domain}/repos/{owner}/{repo}/commits/{ref}/status"
-        response = requests.get(
+        response = get_session().get(
             url.format(domain=Github.API_URL, owner=owner, repo=repo, ref=ref)
         )
         return response.json()["state"] == "success"
@@ -113,7 +123,7 @@ class Github(Base):
 
         :return: Whether the request succeeded
         """
-        response = requests.post(
+        response = get_session().post(
             f"{Github.API_URL}/repos/{owner}/{repo}/releases",
             json={
                 "tag_name": tag,
@@ -141,7 +151,7 @@ class Github(Base):
 
         :return: ID of found release
         """
-        response = requests.get(
+        response = get_session().get(
             f"{Github.API_URL}/repos/{owner}/{repo}/releases/tags/{tag}",
             headers={"Authorization": "token {}".format(Github.token())},
         )
@@ -163,7 +173,7 @@ class Github(Base):
 
         :return: Whether the request succeeded
         """
-        response = requests.post(
+        response = get_session().post(
             f"{Github.API_URL}/repos/{owner}/{repo}/releases/{id}",
             json={"body": changelog},
             headers={"Authorization": "token {}".format(Github.token())},
@@ -217,15 +227,17 @@ class Github(Base):
         """
         url = "https://uploads.github.com/repos/{owner}/{repo}/releases/{id}/assets"
 
-        response = requests.post(
-            url.format(owner=owner, repo=repo, id=release_id),
-            params={"name": os.path.basename(file), "label": label},
-            headers={
-                "Authorization": "token {}".format(Github.token()),
-                "Content-Type": mimetypes.guess_type(file, strict=False)[0],
-            },
-            data=open(file, "rb").read(),
-        )
+        # Stream the file from disk instead of loading the whole dist in memory
+        with open(file, "rb") as asset:
+            response = get_session().post(
+                url.format(owner=owner, repo=repo, id=release_id),
+                params={"name": os.path.basename(file), "label": label},
+                headers={
+                    "Authorization": "token {}".format(Github.token()),
+                    "Content-Type": mimetypes.guess_type(file, strict=False)[0],
+                },
+                data=asset,
+            )
         logger.debug(
             "Asset upload completed, url: {}, status code: {}".format(
                 response.url, response.status_code
@@ -296,7 +308,11 @@ class Gitlab(Base):
 
         :return: the status of the pipeline (False if a job failed)
         """
-        gl = gitlab.Gitlab(Gitlab.API_URL, private_token=Gitlab.token())
+        import gitlab
+
+        gl = gitlab.Gitlab(
+            Gitlab.API_URL, private_token=Gitlab.token(), session=get_session()
+        )
         gl.auth()
         jobs = gl.projects.get(owner + "/" + repo).commits.get(ref).statuses.list()
         for job in jobs:
@@ -329,8 +345,12 @@ class Gitlab(Base):
 
         :return: The status of the request
         """
+        import gitlab
+
         ref = "v" + version
-        gl = gitlab.Gitlab(Gitlab.API_URL, private_token=Gitlab.token())
+        gl = gitlab.Gitlab(
+            Gitlab.API_URL, private_token=Gitlab.token(), session=get_session()
+        )
         gl.auth()
         try:
             tag = gl.projects.get(owner + "/" + repo).tags.get(ref)
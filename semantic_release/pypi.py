@@ -2,8 +2,6 @@
 """
 import logging
 
-from invoke import run
-
 from semantic_release import ImproperConfigurationError
 
 from .helpers import LoggedFunction
@@ -31,6 +29,8 @@ def upload_to_pypi(
     if username is None or password is None or username == "" or password == "":
         raise ImproperConfigurationError("Missing credentials for uploading")
 
+    from invoke import run
+
     run(
         "twine upload -u '{}' -p '{}' {} \"{}/*\"".format(
             username, password, "--skip-existing" if skip_existing else "", path
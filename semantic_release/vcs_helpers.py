@@ -3,12 +3,18 @@
 import logging
 import os
 import re
-from functools import wraps
+from functools import lru_cache, wraps
 from pathlib import PurePath
 from typing import Optional, Tuple
 from urllib.parse import urlsplit
 
-from git import GitCommandError, InvalidGitRepositoryError, Repo, TagObject
+from git import (
+    GitCmdObjectDB,
+    GitCommandError,
+    InvalidGitRepositoryError,
+    Repo,
+    TagObject,
+)
 from git.exc import BadName
 
 from .errors import GitError, HvcsRepoParseError
@@ -16,7 +22,9 @@ from .helpers import LoggedFunction
 from .settings import config
 
 try:
-    repo = Repo(".", search_parent_directories=True)
+    # GitCmdObjectDB reads objects through one persistent `git cat-file --batch`
+    # process, so walking the commit log does not spawn a process per commit.
+    repo = Repo(".", search_parent_directories=True, odbt=GitCmdObjectDB)
 except InvalidGitRepositoryError:
     repo = None
 
@@ -93,12 +101,15 @@ def get_version_from_tag(tag_name: str) -> Optional[str]:
     return None
 
 
+@lru_cache(maxsize=1)
 @check_repo
 @LoggedFunction(logger)
 def get_repository_owner_and_name() -> Tuple[str, str]:
     """
     Check the 'origin' remote to get the owner and name of the remote repository.
 
+    The remote does not change while a command runs, so the result is cached.
+
     :return: A tuple of the owner and name.
     """
     url = repo.remote("origin").url
@@ -118,7 +129,7 @@ def get_current_head_hash() -> str:
 
     :return: The commit hash.
     """
-    return repo.head.commit.name_rev.split(" ")[0]
+    return repo.head.commit.hexsha
 
 
 @check_repo
@@ -177,6 +188,9 @@ def push_new_version(
     """
     Run git push and git push --tags.
 
+    The branch is pushed first, so that a rejected branch push fails before
+    any release tag reaches the remote.
+
     :param auth_token: Authentication token used to push.
     :param owner: Organisation or user that owns the repository.
     :param name: Name of repository.
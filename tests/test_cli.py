@@ -1,7 +1,15 @@
 from click.testing import CliRunner
 
 import semantic_release
-from semantic_release.cli import changelog, main, publish, version
+from semantic_release.cli import (
+    changelog,
+    entry,
+    filter_output_for_secrets,
+    get_secrets,
+    main,
+    publish,
+    version,
+)
 from semantic_release.errors import GitError, ImproperConfigurationError
 
 from . import mock, pytest, reset_config
@@ -24,6 +32,34 @@ def test_main_should_call_correct_function(mocker, runner):
     assert result.exit_code == 0
 
 
+def test_main_should_log_debug_information(mocker, runner):
+    mocker.patch("semantic_release.cli.version")
+    result = runner.invoke(main, ["--verbosity", "DEBUG", "version"])
+    assert "Main args: {" in result.output
+    assert "Main config: {" in result.output
+    assert result.exit_code == 0
+
+
+def test_main_should_not_log_debug_information_by_default(mocker, runner):
+    mocker.patch("semantic_release.cli.version")
+    mock_config_get = mocker.patch("semantic_release.cli.config.get")
+    result = runner.invoke(main, ["version"])
+    assert "Main args" not in result.output
+    assert not mock_config_get.called
+    assert result.exit_code == 0
+
+
+def test_entry_should_move_flags_after_command(mocker):
+    mock_main = mocker.patch("semantic_release.cli.main")
+    mocker.patch(
+        "sys.argv", ["semantic-release", "--noop", "-D", "a=b", "version", "--patch"]
+    )
+    entry()
+    mock_main.assert_called_once_with(
+        args=["-D", "a=b", "version", "--noop", "--patch"]
+    )
+
+
 def test_version_by_commit_should_call_correct_functions(mocker, runner):
     mocker.patch("semantic_release.cli.config.getboolean", lambda *x: False)
     mock_tag_new_version = mocker.patch("semantic_release.cli.tag_new_version")
@@ -59,16 +95,14 @@ def test_version_by_tag_should_call_correct_functions(mocker, runner):
             and args[1] == "version_source"
         ):
             return "tag"
-        elif (
-            len(args) >= 2
-            and args[0] == "semantic_release"
-            and args[1] == "commit_version_number"
-        ):
-            return True
         return orig(*args, **kwargs)
 
     mocker.patch("semantic_release.cli.config.get", wrapped_config_get)
-    mocker.patch("semantic_release.cli.config.getboolean", lambda *x: False)
+    mocker.patch("semantic_release.cli.config.has_option", lambda *x: True)
+    mocker.patch(
+        "semantic_release.cli.config.getboolean",
+        lambda *x: x[1] == "commit_version_number",
+    )
     mock_set_new_version = mocker.patch("semantic_release.cli.set_new_version")
     mock_tag_new_version = mocker.patch("semantic_release.cli.tag_new_version")
     mock_commit_new_version = mocker.patch("semantic_release.cli.commit_new_version")
@@ -127,6 +161,22 @@ def test_version_by_tag_with_commit_version_number_should_call_correct_functions
     assert result.exit_code == 0
 
 
+def test_version_by_commit_without_commit_version_number(mocker, runner):
+    mocker.patch("semantic_release.cli.config.has_option", lambda *x: True)
+    mocker.patch("semantic_release.cli.config.getboolean", lambda *x: False)
+    mock_set_new_version = mocker.patch("semantic_release.cli.set_new_version")
+    mock_tag_new_version = mocker.patch("semantic_release.cli.tag_new_version")
+    mock_commit_new_version = mocker.patch("semantic_release.cli.commit_new_version")
+    mocker.patch("semantic_release.cli.get_new_version", return_value="2.0.0")
+    mocker.patch("semantic_release.cli.evaluate_version_bump", return_value="major")
+    mocker.patch("semantic_release.cli.get_current_version", return_value="1.2.3")
+    result = runner.invoke(main, ["version"])
+    mock_set_new_version.assert_called_once_with("2.0.0")
+    assert not mock_commit_new_version.called
+    mock_tag_new_version.assert_called_once_with("2.0.0")
+    assert result.exit_code == 0
+
+
 def test_force_major(mocker, runner):
     mock_version = mocker.patch("semantic_release.cli.version")
     result = runner.invoke(main, ["version", "--major"])
@@ -303,6 +353,31 @@ def test_version_retry(mocker):
     mock_get_new.assert_called_once_with("current", "patch")
 
 
+def test_version_with_computed_versions(mocker):
+    mock_get_current = mocker.patch("semantic_release.cli.get_current_version")
+    mock_evaluate_bump = mocker.patch("semantic_release.cli.evaluate_version_bump")
+    mock_get_new = mocker.patch("semantic_release.cli.get_new_version")
+    mock_set_new = mocker.patch("semantic_release.cli.set_new_version")
+    mocker.patch("semantic_release.cli.commit_new_version")
+    mocker.patch("semantic_release.cli.tag_new_version")
+    mocker.patch("semantic_release.cli.config.getboolean", lambda *x: False)
+
+    result = version(
+        current_version="1.2.3",
+        new_version="1.3.0",
+        level_bump="minor",
+        noop=False,
+        retry=False,
+        force_level=None,
+    )
+
+    assert result
+    assert not mock_get_current.called
+    assert not mock_evaluate_bump.called
+    assert not mock_get_new.called
+    mock_set_new.assert_called_once_with("1.3.0")
+
+
 def test_publish_should_not_upload_to_pypi_if_option_is_false(mocker, runner):
     mocker.patch("semantic_release.cli.checkout")
     mocker.patch("semantic_release.cli.ci_checks.check")
@@ -331,9 +406,17 @@ def test_publish_should_do_nothing_when_version_fails(mocker, runner):
     mock_push = mocker.patch("semantic_release.cli.push_new_version")
     mock_ci_check = mocker.patch("semantic_release.ci_checks.check")
     mock_version = mocker.patch("semantic_release.cli.version", return_value=False)
+    mocker.patch("semantic_release.cli.get_current_version", return_value="1.2.3")
     result = runner.invoke(main, ["publish"])
     mock_version.assert_called_once_with(
-        noop=False, post=False, force_level=None, retry=False, define=(),
+        current_version="1.2.3",
+        new_version="2.0.0",
+        level_bump="feature",
+        noop=False,
+        post=False,
+        force_level=None,
+        retry=False,
+        define=(),
     )
     assert not mock_push.called
     assert not mock_upload_pypi.called
@@ -362,6 +445,7 @@ def test_publish_should_call_functions(mocker, runner):
     mocker.patch("semantic_release.cli.markdown_changelog", lambda *x, **y: "CHANGES")
     mocker.patch("semantic_release.cli.get_new_version", lambda *x: "2.0.0")
     mocker.patch("semantic_release.cli.check_token", lambda: True)
+    mocker.patch("semantic_release.cli.get_current_version", return_value="1.2.3")
 
     result = runner.invoke(main, ["publish"])
     print(result.output)  # Print output for debugging should the test fail
@@ -374,7 +458,14 @@ def test_publish_should_call_functions(mocker, runner):
     assert mock_pypi.called
     assert mock_release.called
     mock_version.assert_called_once_with(
-        noop=False, post=False, force_level=None, retry=False, define=(),
+        current_version="1.2.3",
+        new_version="2.0.0",
+        level_bump="feature",
+        noop=False,
+        post=False,
+        force_level=None,
+        retry=False,
+        define=(),
     )
     mock_log.assert_called_once_with(
         u"relekang", "python-semantic-release", "2.0.0", "CHANGES"
@@ -405,7 +496,9 @@ def test_publish_retry_version_fail(mocker):
     mock_get_owner_name.assert_called_once_with()
     mock_ci_check.assert_called()
     mock_checkout.assert_called_once_with("my_branch")
-    mock_version.assert_called_once_with(noop=False, retry=True, force_level=False)
+    mock_version.assert_called_once_with(
+        current_version="current", noop=False, retry=True, force_level=False
+    )
 
 
 def test_publish_bad_token(mocker):
@@ -442,7 +535,9 @@ def test_publish_bad_token(mocker):
     mock_get_owner_name.assert_called_once_with()
     mock_ci_check.assert_called()
     mock_checkout.assert_called_once_with("my_branch")
-    mock_version.assert_called_once_with(noop=False, retry=True, force_level=False)
+    mock_version.assert_called_once_with(
+        current_version="current", noop=False, retry=True, force_level=False
+    )
     mock_get_token.assert_called()
     mock_get_domain.assert_called()
     mock_push.assert_called_once_with(
@@ -502,7 +597,14 @@ def test_publish_giterror_when_posting(mocker):
     mock_get_owner_name.assert_called_once_with()
     mock_ci_check.assert_called()
     mock_checkout.assert_called_once_with("my_branch")
-    mock_version.assert_called_once_with(noop=False, retry=False, force_level=False)
+    mock_version.assert_called_once_with(
+        current_version="current",
+        new_version="new",
+        level_bump="patch",
+        noop=False,
+        retry=False,
+        force_level=False,
+    )
     mock_get_token.assert_called_once_with()
     mock_get_domain.assert_called_once_with()
     mock_push.assert_called_once_with(
@@ -518,6 +620,114 @@ def test_publish_giterror_when_posting(mocker):
     mock_post.assert_called_once_with("owner", "name", "new", "super md changelog")
 
 
+def test_publish_pypi_error_does_not_stop_hvcs_upload(mocker):
+    mocker.patch("semantic_release.cli.get_current_version", return_value="current")
+    mocker.patch("semantic_release.cli.evaluate_version_bump", return_value="patch")
+    mocker.patch("semantic_release.cli.get_new_version", return_value="new")
+    mocker.patch(
+        "semantic_release.cli.get_repository_owner_and_name",
+        return_value=("owner", "name"),
+    )
+    mocker.patch("semantic_release.ci_checks.check")
+    mocker.patch("semantic_release.cli.checkout")
+    mocker.patch("semantic_release.cli.config.get", return_value="dist")
+    mocker.patch("semantic_release.cli.config.getboolean", return_value=True)
+    mocker.patch("semantic_release.cli.version", return_value=True)
+    mocker.patch("semantic_release.cli.get_token", return_value="SUPERTOKEN")
+    mocker.patch("semantic_release.cli.get_domain", return_value="domain")
+    mocker.patch("semantic_release.cli.push_new_version")
+    mock_check_token = mocker.patch(
+        "semantic_release.cli.check_token", return_value=True
+    )
+    mocker.patch("semantic_release.cli.build_dists")
+    mock_remove_dists = mocker.patch("semantic_release.cli.remove_dists")
+    mocker.patch("semantic_release.cli.generate_changelog")
+    mocker.patch("semantic_release.cli.markdown_changelog", return_value="CHANGES")
+    mocker.patch(
+        "semantic_release.cli.upload_to_pypi",
+        mock.Mock(side_effect=ImproperConfigurationError("pypi")),
+    )
+    mock_post = mocker.patch("semantic_release.cli.post_changelog")
+    mock_release = mocker.patch("semantic_release.cli.upload_to_release")
+
+    with pytest.raises(ImproperConfigurationError):
+        publish(noop=False, retry=False, force_level=False)
+
+    mock_post.assert_called_once_with("owner", "name", "new", "CHANGES")
+    mock_release.assert_called_once_with("owner", "name", "new", "dist")
+    mock_check_token.assert_called_once_with()
+    # Only the clean-up before building ran, the failure stopped the final one
+    mock_remove_dists.assert_called_once_with("dist")
+
+
+def test_publish_changelog_error_does_not_hide_pypi_error(mocker):
+    mocker.patch("semantic_release.cli.get_current_version", return_value="current")
+    mocker.patch("semantic_release.cli.evaluate_version_bump", return_value="patch")
+    mocker.patch("semantic_release.cli.get_new_version", return_value="new")
+    mocker.patch(
+        "semantic_release.cli.get_repository_owner_and_name",
+        return_value=("owner", "name"),
+    )
+    mocker.patch("semantic_release.ci_checks.check")
+    mocker.patch("semantic_release.cli.checkout")
+    mocker.patch("semantic_release.cli.config.get", return_value="dist")
+    mocker.patch("semantic_release.cli.version", return_value=True)
+    mocker.patch("semantic_release.cli.get_token", return_value="SUPERTOKEN")
+    mocker.patch("semantic_release.cli.get_domain", return_value="domain")
+    mocker.patch("semantic_release.cli.push_new_version")
+    mocker.patch("semantic_release.cli.build_dists")
+    mocker.patch("semantic_release.cli.remove_dists")
+    mocker.patch("semantic_release.cli.config.getboolean", return_value=True)
+    mocker.patch("semantic_release.cli.check_token", return_value=True)
+    mocker.patch("semantic_release.cli.generate_changelog")
+    mocker.patch(
+        "semantic_release.cli.markdown_changelog",
+        mock.Mock(side_effect=KeyError("template")),
+    )
+    mocker.patch(
+        "semantic_release.cli.upload_to_pypi",
+        mock.Mock(side_effect=ImproperConfigurationError("pypi failed")),
+    )
+    mock_publish_to_hvcs = mocker.patch("semantic_release.cli.publish_to_hvcs")
+    mock_logger_error = mocker.patch("semantic_release.cli.logger.error")
+
+    with pytest.raises(KeyError):
+        publish(noop=False, retry=False, force_level=False)
+
+    mock_logger_error.assert_called_once_with("pypi failed")
+    assert not mock_publish_to_hvcs.called
+
+
+def test_publish_should_not_submit_hvcs_job_without_work(mocker):
+    mocker.patch("semantic_release.cli.get_current_version", return_value="current")
+    mocker.patch("semantic_release.cli.evaluate_version_bump", return_value="patch")
+    mocker.patch("semantic_release.cli.get_new_version", return_value="new")
+    mocker.patch(
+        "semantic_release.cli.get_repository_owner_and_name",
+        return_value=("owner", "name"),
+    )
+    mocker.patch("semantic_release.ci_checks.check")
+    mocker.patch("semantic_release.cli.checkout")
+    mocker.patch("semantic_release.cli.config.get", return_value="dist")
+    mocker.patch("semantic_release.cli.version", return_value=True)
+    mocker.patch("semantic_release.cli.get_token", return_value="SUPERTOKEN")
+    mocker.patch("semantic_release.cli.get_domain", return_value="domain")
+    mocker.patch("semantic_release.cli.push_new_version")
+    mocker.patch("semantic_release.cli.build_dists")
+    mocker.patch("semantic_release.cli.remove_dists")
+    mocker.patch(
+        "semantic_release.cli.config.getboolean", lambda *x: x[1] == "upload_to_pypi",
+    )
+    mocker.patch("semantic_release.cli.check_token", return_value=False)
+    mock_pypi = mocker.patch("semantic_release.cli.upload_to_pypi")
+    mock_publish_to_hvcs = mocker.patch("semantic_release.cli.publish_to_hvcs")
+
+    publish(noop=False, retry=False, force_level=False)
+
+    assert mock_pypi.called
+    assert not mock_publish_to_hvcs.called
+
+
 def test_changelog_should_call_functions(mocker, runner):
     mock_changelog = mocker.patch("semantic_release.cli.changelog", return_value=True)
     result = runner.invoke(main, ["changelog"])
@@ -587,7 +797,7 @@ def test_changelog_post_unreleased_no_token(mocker):
 
     changelog(unreleased=True, post=True)
 
-    mock_previous_version.assert_called_once_with("current")
+    assert not mock_previous_version.called
     mock_generate_changelog.assert_called_once_with("current", None)
     mock_markdown_changelog.assert_called_once_with(
         "current", "super changelog", header=False
@@ -617,9 +827,11 @@ def test_changelog_post_complete(mocker):
 
     changelog(unreleased=True, post=True)
 
-    mock_previous_version.assert_called_once_with("current")
+    assert not mock_previous_version.called
     mock_generate_changelog.assert_called_once_with("current", None)
-    mock_markdown_changelog.assert_any_call("current", "super changelog", header=False)
+    mock_markdown_changelog.assert_called_once_with(
+        "current", "super changelog", header=False
+    )
     mock_check_token.assert_called_once_with()
     mock_get_owner_name.assert_called_once_with()
     mock_post_changelog.assert_called_once_with(
@@ -631,3 +843,57 @@ def test_changelog_raises_exception_when_no_current_version(mocker):
     mocker.patch("semantic_release.cli.get_current_version", return_value=None)
     with pytest.raises(ImproperConfigurationError):
         changelog()
+
+
+@pytest.fixture
+def clear_secrets():
+    get_secrets.cache_clear()
+    yield
+    get_secrets.cache_clear()
+
+
+def test_filter_output_for_secrets(monkeypatch, clear_secrets):
+    monkeypatch.setenv("PYPI_USERNAME", "user")
+    monkeypatch.setenv("PYPI_PASSWORD", "user-password")
+    monkeypatch.setenv("GH_TOKEN", "")
+    monkeypatch.delenv("GL_TOKEN", raising=False)
+
+    assert (
+        filter_output_for_secrets("twine upload -u 'user' -p 'user-password'")
+        == "twine upload -u '$PYPI_USERNAME' -p '$PYPI_PASSWORD'"
+    )
+
+
+def test_filter_output_for_secrets_without_secrets(monkeypatch, clear_secrets):
+    for secret_name in ["PYPI_USERNAME", "PYPI_PASSWORD", "GH_TOKEN", "GL_TOKEN"]:
+        monkeypatch.delenv(secret_name, raising=False)
+
+    assert filter_output_for_secrets("nothing to hide") == "nothing to hide"
+
+
+def test_secrets_are_only_read_once(monkeypatch, clear_secrets):
+    monkeypatch.setenv("GH_TOKEN", "token")
+    assert filter_output_for_secrets("token") == "$GH_TOKEN"
+
+    monkeypatch.setenv("GH_TOKEN", "other")
+    assert get_secrets()["token"] == "GH_TOKEN"
+    assert "other" not in get_secrets()
+
+
+def test_cmd_should_log_errors_without_secrets(
+    mocker, runner, monkeypatch, clear_secrets
+):
+    monkeypatch.setenv("GH_TOKEN", "super-token")
+    mocker.patch(
+        "semantic_release.cli.version",
+        mock.Mock(side_effect=GitError("push with super-token failed")),
+    )
+    result = runner.invoke(main, ["version"])
+    assert "push with $GH_TOKEN failed" in result.output
+    assert "super-token" not in result.output
+    assert result.exit_code == 1
+
+
+def test_cmd_should_return_exit_code_when_not_standalone(mocker):
+    mocker.patch("semantic_release.cli.version", mock.Mock(side_effect=GitError()))
+    assert main.main(["version"], standalone_mode=False) == 1
@@ -9,6 +9,6 @@ from . import pytest
 )
 def test_build_command(mocker, commands):
     mocker.patch("semantic_release.dist.config.get", lambda *a: commands)
-    mock_run = mocker.patch("semantic_release.dist.run")
+    mock_run = mocker.patch("invoke.run")
     build_dists()
     mock_run.assert_called_once_with(commands)
@@ -13,6 +13,7 @@ from semantic_release.hvcs import (
     check_build_status,
     check_token,
     get_hvcs,
+    get_session,
     post_changelog,
 )
 
@@ -47,6 +48,40 @@ def test_check_build_status(mock_github_helper):
     mock_github_helper.assert_called_once_with("owner", "name", "ref")
 
 
+def test_get_session_should_be_shared():
+    assert get_session() is get_session()
+
+
+@mock.patch("semantic_release.hvcs.get_session")
+def test_github_should_use_shared_session(mock_get_session):
+    mock_session = mock_get_session.return_value
+    mock_session.get.return_value.json.return_value = {"state": "success"}
+    mock_session.post.return_value.status_code = 201
+
+    assert Github.check_build_status("owner", "repo", "ref")
+    assert Github.create_release("owner", "repo", "v1.0.0", "changelog")
+
+    mock_session.get.assert_called_once_with(
+        "https://api.github.com/repos/owner/repo/commits/ref/status"
+    )
+    assert mock_session.post.call_args[0] == (
+        "https://api.github.com/repos/owner/repo/releases",
+    )
+
+
+@mock.patch("os.environ", {"GL_TOKEN": "token"})
+@mock.patch("semantic_release.hvcs.get_session")
+@mock.patch("gitlab.Gitlab")
+def test_gitlab_should_use_shared_session(mock_gitlab_client, mock_get_session):
+    assert Gitlab.check_build_status("owner", "repo", "ref")
+    assert Gitlab.post_release_changelog("owner", "repo", "1.0.0", "changelog")
+
+    expected_call = mock.call(
+        Gitlab.API_URL, private_token="token", session=mock_get_session.return_value
+    )
+    assert mock_gitlab_client.call_args_list == [expected_call, expected_call]
+
+
 @mock.patch("os.environ", {"GH_TOKEN": "token"})
 def test_check_token_should_return_true():
     assert check_token() is True
@@ -216,7 +251,9 @@ class GithubReleaseTests(TestCase):
             dummy_file.write(dummy_content)
 
         def request_callback(request):
-            self.assertEqual(request.body.decode().replace("\r\n", "\n"), dummy_content)
+            self.assertEqual(
+                request.body.read().decode().replace("\r\n", "\n"), dummy_content
+            )
             self.assertEqual(request.url, self.asset_url_params)
             self.assertEqual(request.headers["Content-Type"], "text/markdown")
             self.assertEqual("token super-token", request.headers["Authorization"])
@@ -245,7 +282,9 @@ class GithubReleaseTests(TestCase):
             dummy_file.write(dummy_content)
 
         def request_callback(request):
-            self.assertEqual(request.body.decode().replace("\r\n", "\n"), dummy_content)
+            self.assertEqual(
+                request.body.read().decode().replace("\r\n", "\n"), dummy_content
+            )
             self.assertEqual(request.url, self.dist_asset_url_params)
             self.assertEqual(request.headers["Content-Type"], "text/markdown")
             self.assertEqual("token super-token", request.headers["Authorization"])
@@ -7,7 +7,7 @@ from . import mock
 
 
 class PypiTests(TestCase):
-    @mock.patch("semantic_release.pypi.run")
+    @mock.patch("invoke.run")
     def test_upload_without_arguments(self, mock_run):
         upload_to_pypi(username="username", password="password")
         self.assertEqual(
@@ -15,7 +15,7 @@ class PypiTests(TestCase):
             [mock.call("twine upload -u 'username' -p 'password'  \"dist/*\"")],
         )
 
-    @mock.patch("semantic_release.pypi.run")
+    @mock.patch("invoke.run")
     def test_upload_with_custom_path(self, mock_run):
         upload_to_pypi(path="custom-dist", username="username", password="password")
         self.assertEqual(
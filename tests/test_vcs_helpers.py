@@ -27,6 +27,13 @@ def mock_git(mocker):
     return mocker.patch("semantic_release.vcs_helpers.repo.git")
 
 
+@pytest.fixture
+def clear_owner_and_name():
+    get_repository_owner_and_name.cache_clear()
+    yield
+    get_repository_owner_and_name.cache_clear()
+
+
 @mock.patch("semantic_release.vcs_helpers.repo", None)
 def test_raises_error_when_invalid_repo():
     with pytest.raises(GitError):
@@ -77,16 +84,18 @@ def test_tag_new_version(mock_git):
 
 def test_push_new_version(mock_git):
     push_new_version()
-    mock_git.push.assert_has_calls(
-        [mock.call("origin", "master"), mock.call("--tags", "origin", "master"),]
-    )
+    assert mock_git.push.call_args_list == [
+        mock.call("origin", "master"),
+        mock.call("--tags", "origin", "master"),
+    ]
 
 
 def test_push_new_version_with_custom_branch(mock_git):
     push_new_version(branch="release")
-    mock_git.push.assert_has_calls(
-        [mock.call("origin", "release"), mock.call("--tags", "origin", "release"),]
-    )
+    assert mock_git.push.call_args_list == [
+        mock.call("origin", "release"),
+        mock.call("--tags", "origin", "release"),
+    ]
 
 
 @pytest.mark.parametrize(
@@ -142,7 +151,9 @@ def test_push_new_version_with_custom_branch(mock_git):
         ("bad_repo_url", HvcsRepoParseError),
     ],
 )
-def test_get_repository_owner_and_name(mocker, origin_url, expected_result):
+def test_get_repository_owner_and_name(
+    mocker, origin_url, expected_result, clear_owner_and_name
+):
     class FakeRemote:
         url = origin_url
 
@@ -154,8 +165,18 @@ def test_get_repository_owner_and_name(mocker, origin_url, expected_result):
             get_repository_owner_and_name()
 
 
+def test_get_repository_owner_and_name_is_cached(mocker, clear_owner_and_name):
+    class FakeRemote:
+        url = "git@github.com:group/project.git"
+
+    mock_remote = mocker.patch("git.repo.base.Repo.remote", return_value=FakeRemote())
+    assert get_repository_owner_and_name() == ("group", "project")
+    assert get_repository_owner_and_name() == ("group", "project")
+    mock_remote.assert_called_once_with("origin")
+
+
 def test_get_current_head_hash(mocker):
-    mocker.patch("git.objects.commit.Commit.name_rev", "commit-hash branch-name")
+    mocker.patch("git.objects.commit.Commit.hexsha", "commit-hash")
     assert get_current_head_hash() == "commit-hash"
 
 
@@ -173,6 +194,15 @@ def test_push_should_not_print_auth_token(mock_gitlab, mock_git):
     assert "auth--token" not in str(excinfo)
 
 
+def test_push_should_not_push_tags_when_branch_is_rejected(mock_git):
+    mock_git.configure_mock(
+        **{"push.side_effect": GitCommandError("git push", 1, b"", b"rejected")}
+    )
+    with pytest.raises(GitError):
+        push_new_version()
+    mock_git.push.assert_called_once_with("origin", "master")
+
+
 def test_checkout_should_checkout_correct_branch(mock_git):
     checkout("a-branch")
     mock_git.checkout.assert_called_once_with("a-branch")